@@ -0,0 +1,10 @@
+import * as fs from "node:fs";
+import type { Emitter } from "@/core/emitter";
+
+export const build = (emitter: Emitter, outputPath: string) => {
+  fs.writeFileSync(outputPath, emitter.emitElf(), { mode: 0o755 });
+};
+
+export const buildMany = (jobs: Iterable<readonly [Emitter, string]>) => {
+  for (const [emitter, outputPath] of jobs) build(emitter, outputPath);
+};
@@ -0,0 +1,39 @@
+const elfBase = 0x400000n;
+// Elf64_Ehdr (64 bytes) + a single Elf64_Phdr (56 bytes)
+export const headerSize = 120;
+
+export const elfExecutable = (
+  code: ArrayLike<number>,
+  data: ArrayLike<number>,
+): Buffer => {
+  const fileSize = headerSize + code.length + data.length;
+  const output = Buffer.alloc(fileSize);
+
+  // Elf64_Ehdr
+  output.write("\x7fELF", 0, "latin1");
+  output[4] = 2; // ELFCLASS64
+  output[5] = 1; // ELFDATA2LSB
+  output[6] = 1; // EV_CURRENT
+  output.writeUInt16LE(2, 16); // e_type: ET_EXEC
+  output.writeUInt16LE(0x3e, 18); // e_machine: EM_X86_64
+  output.writeUInt32LE(1, 20); // e_version
+  output.writeBigUInt64LE(elfBase + BigInt(headerSize), 24); // e_entry
+  output.writeBigUInt64LE(64n, 32); // e_phoff
+  output.writeUInt16LE(64, 52); // e_ehsize
+  output.writeUInt16LE(56, 54); // e_phentsize
+  output.writeUInt16LE(1, 56); // e_phnum
+
+  // Elf64_Phdr: one PT_LOAD covering the headers, code and data
+  output.writeUInt32LE(1, 64); // p_type: PT_LOAD
+  output.writeUInt32LE(5, 68); // p_flags: PF_R | PF_X
+  output.writeBigUInt64LE(0n, 72); // p_offset
+  output.writeBigUInt64LE(elfBase, 80); // p_vaddr
+  output.writeBigUInt64LE(elfBase, 88); // p_paddr
+  output.writeBigUInt64LE(BigInt(fileSize), 96); // p_filesz
+  output.writeBigUInt64LE(BigInt(fileSize), 104); // p_memsz
+  output.writeBigUInt64LE(0x1000n, 112); // p_align
+
+  output.set(code, headerSize);
+  output.set(data, headerSize + code.length);
+  return output;
+};
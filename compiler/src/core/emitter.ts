@@ -0,0 +1,165 @@
+import { elfExecutable, headerSize } from "@/core/elf";
+
+interface Fixup {
+  readonly offset: number;
+  readonly dataOffset: number;
+}
+
+// comma-prefixed so db lines concatenate without a join
+const byteLiterals = Array.from({ length: 256 }, (_, byte) => `,${byte}`);
+
+const registers = {
+  rax: 0,
+  rdx: 2,
+  rsi: 6,
+  rdi: 7,
+} as const;
+
+type Register = keyof typeof registers;
+
+interface LoadImmTemplate {
+  readonly text: string;
+  readonly bytes: readonly number[];
+}
+
+// interned per (register, value); bounded so odd programs cannot grow it forever
+const loadImmCache = new Map<string, LoadImmTemplate>();
+const loadImmCacheLimit = 4096;
+
+const dwordName = (register: Register) => `e${register.slice(1)}`;
+
+const pushImmediate = (bytes: number[], value: number, size: number) => {
+  const bits = BigInt.asUintN(size * 8, BigInt(value));
+  for (let i = 0; i < size; i++)
+    bytes.push(Number((bits >> BigInt(i * 8)) & 0xffn));
+};
+
+const encodeLoadImm = (register: Register, value: number): LoadImmTemplate => {
+  const code = registers[register];
+
+  if (value === 0) {
+    // 31 /r on the 32-bit register: zero-extends and needs no REX prefix
+    const dword = dwordName(register);
+    return {
+      text: `\n  xor ${dword}, ${dword}`,
+      bytes: [0x31, 0xc0 | (code << 3) | code],
+    };
+  }
+
+  if (value > 0 && value < 128)
+    // 6A ib + 58+r: three bytes instead of five
+    return {
+      text: `\n  push ${value}\n  pop ${register}`,
+      bytes: [0x6a, value, 0x58 | code],
+    };
+
+  if (value > 0 && value <= 0xffffffff) {
+    // B8+r id: mov r32, imm32 zero-extends into the full register
+    const bytes = [0xb8 | code];
+    pushImmediate(bytes, value, 4);
+    return { text: `\n  mov ${dwordName(register)}, ${value}`, bytes };
+  }
+
+  if (value < 0 && value >= -0x80000000) {
+    // REX.W C7 /0: mov r64, imm32 (sign-extended)
+    const bytes = [0x48, 0xc7, 0xc0 | code];
+    pushImmediate(bytes, value, 4);
+    return { text: `\n  mov ${register}, ${value}`, bytes };
+  }
+
+  // REX.W B8+r io: mov r64, imm64
+  const bytes = [0x48, 0xb8 | code];
+  pushImmediate(bytes, value, 8);
+  return { text: `\n  mov ${register}, ${value}`, bytes };
+};
+
+export class Emitter {
+  private bss = "";
+  private data = "";
+  private start = "";
+  private code: number[] = [];
+  private dataBytes: number[] = [];
+  private fixups: Fixup[] = [];
+  private labelCount = 0;
+  private cachedAsm: string | null = null;
+  private cachedElf: Buffer | null = null;
+  private terminated = false;
+
+  public syscallExit(code: number) {
+    // exit never returns, so anything emitted after it is dead code
+    if (this.terminated) return;
+    this.terminated = true;
+    this.cachedAsm = null;
+    this.cachedElf = null;
+    this.loadImm("rax", 60);
+    this.loadImm("rdi", code);
+    this.syscall();
+  }
+
+  public syscallWrite(fd: number, buf: string) {
+    if (this.terminated) return;
+    const bytes = Buffer.from(buf, "utf8");
+    if (bytes.length === 0) return;
+    this.cachedAsm = null;
+    this.cachedElf = null;
+    const label = this.nextLabel();
+    const dataOffset = this.dataBytes.length;
+    for (const byte of bytes) this.dataBytes.push(byte);
+    let literals = "";
+    for (const byte of bytes) literals += byteLiterals[byte];
+    this.data += `\n  ${label}: db ${literals.slice(1)}`;
+
+    this.loadImm("rax", 1);
+    this.loadImm("rdi", fd);
+    this.leaData("rsi", label, dataOffset);
+    this.loadImm("rdx", bytes.length);
+    this.syscall();
+  }
+
+  public emitElf(): Buffer {
+    if (this.cachedElf) return this.cachedElf;
+    const output = elfExecutable(this.code, this.dataBytes);
+    // .data is laid out immediately after the code in the LOAD segment
+    for (const fixup of this.fixups)
+      output.writeInt32LE(
+        this.code.length + fixup.dataOffset - (fixup.offset + 4),
+        headerSize + fixup.offset,
+      );
+    this.cachedElf = output;
+    return output;
+  }
+
+  public get asm(): string {
+    this.cachedAsm ??= `section .bss${this.bss}\nsection .data${this.data}\nsection .text\nglobal _start\n_start:${this.start}\n`;
+    return this.cachedAsm;
+  }
+
+  private loadImm(register: Register, value: number) {
+    const key = `${register},${value}`;
+    let template = loadImmCache.get(key);
+    if (!template) {
+      template = encodeLoadImm(register, value);
+      if (loadImmCache.size < loadImmCacheLimit)
+        loadImmCache.set(key, template);
+    }
+    this.start += template.text;
+    this.code.push(...template.bytes);
+  }
+
+  private leaData(register: Register, label: string, dataOffset: number) {
+    this.start += `\n  lea ${register}, [rel ${label}]`;
+    // REX.W 8D /r, RIP-relative (mod=00, rm=101)
+    this.code.push(0x48, 0x8d, (registers[register] << 3) | 0x05);
+    this.fixups.push({ offset: this.code.length, dataOffset });
+    this.code.push(0, 0, 0, 0);
+  }
+
+  private syscall() {
+    this.start += "\n  syscall";
+    this.code.push(0x0f, 0x05);
+  }
+
+  private nextLabel() {
+    return `buf${this.labelCount++}`;
+  }
+}
@@ -0,0 +1,136 @@
+import { spawnSync } from "node:child_process";
+import * as fs from "node:fs";
+import * as os from "node:os";
+import * as path from "node:path";
+import { build, buildMany } from "@/core/builder";
+import { Emitter } from "@/core/emitter";
+import { assert } from "./helpers";
+import { describe, test } from "./tester";
+
+const buildToTemp = (emitter: Emitter) => {
+  const dir = fs.mkdtempSync(path.join(os.tmpdir(), "vek-"));
+  const outputPath = path.join(dir, "out");
+  build(emitter, outputPath);
+  return outputPath;
+};
+
+const runBinary = (outputPath: string) => {
+  const result = spawnSync(outputPath);
+  fs.rmSync(path.dirname(outputPath), { recursive: true, force: true });
+  return result;
+};
+
+describe("emitter", () => {
+  test("asm layout", () => {
+    const emitter = new Emitter();
+    emitter.syscallWrite(1, "hi\n");
+    emitter.syscallExit(0);
+    const { asm } = emitter;
+    assert.ok(asm.includes("section .data"));
+    assert.ok(asm.includes("buf0: db 104,105,10"));
+    assert.ok(asm.includes("push 1\n  pop rax"));
+    assert.ok(asm.includes("lea rsi, [rel buf0]"));
+    assert.ok(asm.includes("push 60\n  pop rax"));
+    assert.ok(asm.includes("xor edi, edi"));
+    assert.ok(asm.endsWith("syscall\n"));
+  });
+
+  test("asm cache invalidates on emit", () => {
+    const emitter = new Emitter();
+    emitter.syscallWrite(1, "a");
+    const before = emitter.asm;
+    assert.equal(emitter.asm, before);
+    emitter.syscallExit(0);
+    assert.notEqual(emitter.asm, before);
+    assert.ok(emitter.asm.includes("push 60\n  pop rax"));
+  });
+
+  test("emits a valid ELF64 executable", () => {
+    const emitter = new Emitter();
+    emitter.syscallExit(0);
+    const outputPath = buildToTemp(emitter);
+    const binary = fs.readFileSync(outputPath);
+    fs.rmSync(path.dirname(outputPath), { recursive: true, force: true });
+    assert.deepEqual([...binary.subarray(0, 4)], [0x7f, 0x45, 0x4c, 0x46]);
+    assert.equal(binary[4], 2); // ELFCLASS64
+    assert.equal(binary.readUInt16LE(18), 0x3e); // EM_X86_64
+    assert.equal(binary.readUInt16LE(56), 1); // one program header
+  });
+
+  test("emitElf cache invalidates on emit", () => {
+    const emitter = new Emitter();
+    emitter.syscallWrite(1, "a");
+    const before = emitter.emitElf();
+    assert.equal(emitter.emitElf(), before);
+    emitter.syscallExit(0);
+    assert.notEqual(emitter.emitElf(), before);
+    assert.ok(emitter.emitElf().length > before.length);
+  });
+
+  test("drops emits after exit", () => {
+    const emitter = new Emitter();
+    emitter.syscallExit(0);
+    const { asm } = emitter;
+    emitter.syscallWrite(1, "unreachable");
+    emitter.syscallExit(1);
+    assert.equal(emitter.asm, asm);
+  });
+
+  test("skips empty writes", () => {
+    const emitter = new Emitter();
+    emitter.syscallWrite(1, "");
+    assert.equal(emitter.asm, new Emitter().asm);
+  });
+
+  test("emitElf bytes match the built file", () => {
+    const emitter = new Emitter();
+    emitter.syscallWrite(1, "abc");
+    emitter.syscallExit(0);
+    const outputPath = buildToTemp(emitter);
+    const binary = fs.readFileSync(outputPath);
+    fs.rmSync(path.dirname(outputPath), { recursive: true, force: true });
+    assert.deepEqual([...binary], [...emitter.emitElf()]);
+  });
+
+  test("binaries carry no sections or symbols to strip", () => {
+    const emitter = new Emitter();
+    emitter.syscallWrite(1, "x");
+    emitter.syscallExit(0);
+    const binary = emitter.emitElf();
+    assert.equal(binary.readBigUInt64LE(40), 0n); // e_shoff
+    assert.equal(binary.readUInt16LE(60), 0); // e_shnum
+  });
+
+  test("exit code round-trips", () => {
+    const emitter = new Emitter();
+    emitter.syscallExit(42);
+    const result = runBinary(buildToTemp(emitter));
+    assert.equal(result.status, 42);
+  });
+
+  test("buildMany builds every target", () => {
+    const first = new Emitter();
+    first.syscallExit(1);
+    const second = new Emitter();
+    second.syscallExit(2);
+    const dir = fs.mkdtempSync(path.join(os.tmpdir(), "vek-"));
+    const firstPath = path.join(dir, "first");
+    const secondPath = path.join(dir, "second");
+    buildMany([
+      [first, firstPath],
+      [second, secondPath],
+    ]);
+    const statuses = [spawnSync(firstPath).status, spawnSync(secondPath).status];
+    fs.rmSync(dir, { recursive: true, force: true });
+    assert.deepEqual(statuses, [1, 2]);
+  });
+
+  test("write syscall outputs data", () => {
+    const emitter = new Emitter();
+    emitter.syscallWrite(1, "hello from vek\n");
+    emitter.syscallExit(0);
+    const result = runBinary(buildToTemp(emitter));
+    assert.equal(result.stdout.toString(), "hello from vek\n");
+    assert.equal(result.status, 0);
+  });
+});
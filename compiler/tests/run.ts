@@ -2,6 +2,7 @@ import "./lexer.test";
 import "./parser.test";
 import "./checker.test";
 import "./modules.test";
+import "./emitter.test";
 import { run } from "./tester";
 
 run();